@@ -9,11 +9,35 @@
 #
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Union
+from asyncio import to_thread
+from functools import lru_cache
+from os import close
+from os import environ
+from os import fstat
+from os import O_RDONLY
+from os import open as os_open
+from os import read
+from os import stat
+from os import stat_result
 from pathlib import Path
 
 from neuro_san.interfaces.coded_tool import CodedTool
 
+try:
+    # Not available on every platform
+    # pylint: disable=ungrouped-imports
+    from os import posix_fadvise
+    from os import POSIX_FADV_SEQUENTIAL
+except ImportError:
+    posix_fadvise = None
+    POSIX_FADV_SEQUENTIAL = None
+
+# Maximum number of file contents kept in memory by TxtLoader.
+# Set the TXT_LOADER_CACHE environment variable to tune this for memory-constrained hosts (0 disables).
+TXT_LOADER_CACHE_SIZE: int = int(environ.get("TXT_LOADER_CACHE", "128"))
+
 
 class TxtLoader(CodedTool):
     """
@@ -50,18 +74,90 @@ class TxtLoader(CodedTool):
         print("############### Document loading done ###############")
         return content
 
+    async def async_invoke(self, args: Dict[str, Any], sly_data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """
+        Asynchronous version of invoke().
+        The file read is blocking disk I/O, so it is handed off to a worker thread
+        in order to not stall the EventLoop for other agent requests.
+
+        :param args: An argument dictionary with the following keys
+                file_path (str): The name of the .txt file to load.
+
+        :param sly_data:
+                None
+
+        :return:
+            If successful:
+                The extracted text from the document.
+            Otherwise:
+                A text string error message in the format:
+                "Error: <error message>"
+        """
+        return await to_thread(self.invoke, args, sly_data)
+
     @staticmethod
     def extract_txt_content(txt_path: Path) -> str:
         """
         Extract text from a plain text file.
+        Contents are cached per process, keyed by the file's modification time and size
+        so that an edited file is read again.
 
         :param txt_path: Full path to the TXT file.
         :return: Content of the text file.
         """
         try:
-            with open(txt_path, "r", encoding="utf-8") as f:
-                return f.read()
+            file_stat: stat_result = stat(txt_path)
+            return TxtLoader.read_cached(str(txt_path), file_stat.st_mtime_ns, file_stat.st_size)
         except Exception as e:
             error = f"Error reading TXT {txt_path}: {e}"
             print(error)
             return error
+
+    @staticmethod
+    @lru_cache(maxsize=TXT_LOADER_CACHE_SIZE)
+    def read_cached(path_str: str, mtime_ns: int, size: int) -> str:
+        """
+        Read the whole of a plain text file, remembering the result.
+        The mtime_ns and size are not used for the read itself.
+        They are only there to be part of the cache key.
+
+        :param path_str: Full path to the TXT file.
+        :param mtime_ns: The modification time of the file in nanoseconds.
+        :param size: The size of the file in bytes.
+        :return: Content of the text file.
+                Exceptions are raised to the caller and are not cached.
+        """
+        _ = mtime_ns, size
+        return TxtLoader.read_txt_content(Path(path_str))
+
+    @staticmethod
+    def read_txt_content(txt_path: Path) -> str:
+        """
+        Read the whole of a plain text file as bytes and decode it in a single call.
+        This skips the incremental decoding of a text-mode file object.
+        Line endings are normalized to "\\n" the same way text mode does it.
+
+        :param txt_path: Full path to the TXT file.
+        :return: Content of the text file.
+                Exceptions from opening, reading or decoding the file are raised to the caller.
+        """
+        fd: int = os_open(txt_path, O_RDONLY)
+        try:
+            if posix_fadvise is not None:
+                # Hint the kernel that we will read the whole file front to back.
+                posix_fadvise(fd, 0, 0, POSIX_FADV_SEQUENTIAL)
+
+            # A single read() can come back short, so keep going until end of file.
+            size: int = fstat(fd).st_size
+            chunks: List[bytes] = []
+            chunk: bytes = read(fd, max(size, 1))
+            while chunk:
+                chunks.append(chunk)
+                chunk = read(fd, max(size, 1))
+        finally:
+            close(fd)
+
+        content: str = b"".join(chunks).decode("utf-8")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
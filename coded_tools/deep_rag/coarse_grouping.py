@@ -12,15 +12,33 @@
 
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Set
 
-from asyncio import Future
-from asyncio import gather
+from asyncio import create_task
+from asyncio import Event
+from asyncio import FIRST_COMPLETED
 from asyncio import Lock
-from copy import deepcopy
+from asyncio import Semaphore
+from asyncio import Task
+from asyncio import TaskGroup
+from asyncio import to_thread
+from asyncio import wait
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from itertools import chain
 from json import dumps
 from logging import getLogger
+from logging import INFO
 from logging import Logger
+from math import ceil
+from os.path import getsize
+from os.path import join
+from statistics import median
+from threading import local
+from time import monotonic
 
 from neuro_san.interfaces.coded_tool import CodedTool
 from neuro_san.internals.graph.activations.branch_activation import BranchActivation
@@ -29,7 +47,98 @@ from neuro_san.internals.parsers.structure.json_structure_parser import JsonStru
 from coded_tools.deep_rag.create_networks import CreateNetworks
 
 
-class CoarseGrouping(BranchActivation, CodedTool):
+class _JsonParserPerThread(local):
+    """
+    Holds one JsonStructureParser for each thread that parses rough_substructure output.
+    The parser keeps state about its last parse, so it is not shared across threads.
+    """
+
+    def __init__(self):
+        """
+        Constructor. Called once on first access from each thread.
+        """
+        super().__init__()
+        self.parser: JsonStructureParser = JsonStructureParser()
+
+
+class _StragglerMonitor:
+    """
+    Keeps count of how many file groups have finished their rough_substructure stage,
+    and signals once enough of them have that the rest may have stragglers.
+    From then on, a call is only considered a straggler once it has been running for
+    well over the median latency of the calls which have finished.
+    """
+
+    # How many times the median latency a call must run for to be considered a straggler.
+    # Comfortably above 1.0, so that calls of typical latency are not duplicated.
+    LATENCY_FACTOR: float = 1.5
+
+    # Shortest time in seconds to wait between straggler checks, so that a median latency
+    # of about zero does not spin the loop while a call waits on the semaphore.
+    MIN_POLL_INTERVAL: float = 0.05
+
+    def __init__(self, num_groups: int, backup_fraction: float):
+        """
+        Constructor.
+        :param num_groups: The number of file groups being worked on
+        :param backup_fraction: The fraction of file groups which must be done
+                    before the remaining ones are given backup calls
+        """
+        self.num_left: int = max(1, ceil(num_groups * backup_fraction))
+        self.stragglers: Event = Event()
+        self.latencies: List[float] = []
+
+    def finished_one(self):
+        """
+        Called when one file group is done with its rough_substructure stage.
+        """
+        self.num_left -= 1
+        if self.num_left <= 0:
+            self.stragglers.set()
+
+    def finished_call(self, latency: float):
+        """
+        Called when one rough_substructure call has returned.
+        :param latency: The number of seconds the call took, from when it started
+        """
+        self.latencies.append(latency)
+
+    async def is_straggler(self, call: Task, start_times: List[float]) -> bool:
+        """
+        Wait until the call is either done or has become a straggler.
+        :param call: The Task doing the call
+        :param start_times: A list which gets the time the call started appended to it,
+                    once it is no longer waiting on any semaphore
+        :return: True if the call is still running and has become a straggler.
+                False if the call is done.
+        """
+        straggling: Task = create_task(self.stragglers.wait())
+        try:
+            await wait({call, straggling}, return_when=FIRST_COMPLETED)
+        finally:
+            straggling.cancel()
+        if call.done():
+            return False
+
+        # At least one group is done by now, so there is a median latency to go by.
+        straggler_latency: float = self.LATENCY_FACTOR * median(self.latencies)
+        while not call.done():
+            # A call which has not started yet cannot be a straggler. Check again later.
+            timeout: float = straggler_latency
+            if start_times:
+                timeout = start_times[0] + straggler_latency - monotonic()
+                if timeout <= 0.0:
+                    return True
+            await wait({call}, timeout=max(timeout, self.MIN_POLL_INTERVAL))
+
+        return False
+
+
+_LOGGER: Logger = getLogger("CoarseGrouping")
+_JSON_PARSERS: _JsonParserPerThread = _JsonParserPerThread()
+
+
+class CoarseGrouping(BranchActivation, CodedTool):  # pylint: disable=too-many-public-methods
     """
     CodedTool implementation that potentially breaks a large list of file references
     into smaller groups where each subgroup of files can be digested by a single pass to the
@@ -46,6 +155,14 @@ class CoarseGrouping(BranchActivation, CodedTool):
     MAX_GROUP_SIZE: int = 6
     MAX_FILES_PER_GROUP: int = 7
     MAX_RETRIES: int = 3
+    # Subgroups each make several LLM/tool calls, so too wide a fan-out invites rate limiting.
+    MAX_PARALLEL_GROUPS: int = 8
+    # Once this fraction of file groups is done with rough_substructure, the stragglers get a
+    # duplicate backup call and whichever call returns first wins.  1.0 turns this off.
+    BACKUP_FRACTION: float = 0.8
+    # Bounds the number of tool calls in flight across all subgroups, backups and splits included,
+    # so provider rate limits show up as predictable queueing rather than retries.
+    MAX_CONCURRENCY: int = 8
 
     async def async_invoke(self, args: Dict[str, Any], sly_data: Dict[str, Any]) -> Any:
         """
@@ -85,11 +202,29 @@ class CoarseGrouping(BranchActivation, CodedTool):
         tools_to_use: Dict[str, str] = args.get("tools", empty)
 
         file_list: List[str] = args.get("file_list", empty_list)
-        max_group_size: int = int(args.get("max_group_size", 42))
+        if not file_list:
+            # Nothing to group. Don't spend a rough_substructure call on an empty group.
+            return "Error: No files provided in the file_list."
+
+        max_group_size: int = self.get_int_arg(args, "max_group_size", 42)
+        if max_group_size <= 0:
+            return f"Error: max_group_size must be positive, not {max_group_size}."
         max_group_size = min(max_group_size, self.MAX_GROUP_SIZE * self.MAX_FILES_PER_GROUP)
         file_groups: List[List[str]] = self.create_groups(file_list, max_group_size)
-
-        # Fill in the common args to be used across all file groups
+        if len(file_groups) > 1 and self.get_bool_arg(args, "balance_by_size", True):
+            # Even out the amount of content per group so no single group is a straggler.
+            file_sizes: List[int] = await to_thread(self.get_file_sizes, file_list,
+                                                    args.get("files_directory", ""))
+            if min(file_sizes) != max(file_sizes):
+                # Uniform sizes gain nothing, so keep contiguous groups for those.
+                file_groups = self.lpt_partition(file_list, file_sizes, len(file_groups), max_group_size)
+        max_parallel_groups: int = self.get_int_arg(args, "max_parallel_groups", self.MAX_PARALLEL_GROUPS)
+        backup_fraction: float = float(args.get("backup_fraction", self.BACKUP_FRACTION))
+        max_concurrency: int = self.get_int_arg(args, "max_concurrency", self.MAX_CONCURRENCY)
+
+        # Fill in the common args to be used across all file groups.
+        # Values here are shared (not copied) across the per-group tool args,
+        # so they must remain immutable.
         basis_args: Dict[str, Any] = {
             "files_directory": args.get("files_directory", ""),
             "user_description": args.get("user_description", ""),
@@ -97,21 +232,62 @@ class CoarseGrouping(BranchActivation, CodedTool):
         }
 
         # Create a single sly_data group_results entry so that parallel tasks have a place
-        # to put their sly_data output without stomping on each other
+        # to put their sly_data output without stomping on each other.
+        # do_subgroups_in_parallel() sizes this for the initial file groups.
         sly_data["group_results"] = []
         sly_data["num_groups"] = 0
         sly_data["lock"] = Lock()
+        sly_data["tool_semaphore"] = Semaphore(max(1, max_concurrency))
         sly_data["agent_reservations"] = []
 
-        _ = await self.do_subgroups_in_parallel(file_groups, basis_args, sly_data, tools_to_use)
+        _ = await self.do_subgroups_in_parallel(file_groups, basis_args, sly_data, tools_to_use,
+                                                max_parallel_groups=max_parallel_groups,
+                                                backup_fraction=backup_fraction)
 
         results: str = await self.process_group_results(sly_data, tools_to_use)
         return results
 
-    def create_groups(self, item_list: List[Any], max_group_size: int) -> List[List[Any]]:
+    @staticmethod
+    def get_int_arg(args: Dict[str, Any], key: str, default: int) -> int:
+        """
+        :param args: The argument dictionary
+        :param key: The key of the integer argument
+        :param default: The value to use when the key is not in the args
+        :return: The argument as an int.  Agents usually hand over ints already,
+                so only convert values which arrive as some other type (like a string).
         """
-        Break a large list into manageable groups
-        :param args: A dictionary of arguments from the invocation of this CodedTool
+        value: Any = args.get(key, default)
+        if isinstance(value, int):
+            return value
+        return int(value)
+
+    @staticmethod
+    def get_bool_arg(args: Dict[str, Any], key: str, default: bool) -> bool:
+        """
+        :param args: The argument dictionary
+        :param key: The key of the boolean argument
+        :param default: The value to use when the key is not in the args,
+                or when its value is a string that does not read as a boolean
+        :return: The argument as a bool.  Agents can hand over booleans as strings like "false",
+                which would otherwise be truthy.
+        """
+        value: Any = args.get(key, default)
+        if not isinstance(value, str):
+            return bool(value)
+
+        value = value.strip().lower()
+        if value in ("true", "yes", "on", "1"):
+            return True
+        if value in ("false", "no", "off", "0"):
+            return False
+        return default
+
+    @staticmethod
+    def create_groups(item_list: List[Any], max_group_size: int) -> List[List[Any]]:
+        """
+        Break a large list into manageable groups.
+        Every item lands in exactly one group, and group sizes differ by at most one.
+        :param item_list: The list of items to break up
         :param max_group_size: The maximum number of items allowed in a single group
         :return: A list of lists of items names
         """
@@ -120,26 +296,81 @@ class CoarseGrouping(BranchActivation, CodedTool):
 
         # Assume at first that this will all fit in a single group
         num_groups: int = 1
-        items_per_group: int = num_items
         if num_items > max_group_size:
-            # This won't fit into a single group. Break it up as evenly as possible
-            num_groups = int(num_items / max_group_size)
-            if num_items % max_group_size != 0:
-                num_groups += 1
-            items_per_group = int(num_items / num_groups)
+            # This won't fit into a single group. Break it up as evenly as possible.
+            # Integer ceiling division keeps this off the float path.
+            num_groups = (num_items + max_group_size - 1) // max_group_size
+
+        # Spread any remainder over the first groups so no group is left short
+        # and no items are left over at the end.
+        items_per_group, remainder = divmod(num_items, num_groups)
 
         # Break the item list into manageable groups
         item_groups: List[List[Any]] = []
+        start_index: int = 0
         for group_index in range(num_groups):
-            start_index: int = group_index * items_per_group
-            end_index: int = start_index + items_per_group
-            end_index = min(end_index, num_items)
+            group_size: int = items_per_group
+            if group_index < remainder:
+                group_size += 1
+            end_index: int = start_index + group_size
             item_groups.append(item_list[start_index:end_index])
+            start_index = end_index
 
         return item_groups
 
+    @staticmethod
+    def get_file_sizes(file_list: List[str], files_directory: str) -> List[int]:
+        """
+        Get the sizes of the files to be grouped, as a cost estimate for each file.
+        This does blocking file system calls, so call it off the EventLoop.
+        :param file_list: The list of file names
+        :param files_directory: The directory where the files can be found
+        :return: A list of file sizes in bytes parallel to the file_list.
+                Files which cannot be found are given a size of 0.
+        """
+        file_sizes: List[int] = []
+        for file_name in file_list:
+            try:
+                file_sizes.append(getsize(join(files_directory, file_name)))
+            except OSError:
+                file_sizes.append(0)
+        return file_sizes
+
+    @staticmethod
+    def lpt_partition(item_list: List[Any], item_sizes: List[int],
+                      num_groups: int, max_group_size: int) -> List[List[Any]]:
+        """
+        Break a list into groups of roughly equal total size using the greedy
+        Longest Processing Time heuristic: biggest items first, each into the currently lightest group
+        that still has room.  Items within each group keep their original relative order.
+        :param item_list: The list of items to break up
+        :param item_sizes: A list of the sizes of each item, parallel to the item_list
+        :param num_groups: The number of groups to create
+        :param max_group_size: The maximum number of items allowed in a single group
+        :return: A list of lists of items
+        """
+        # Heap entries are (total size, number of items, group index) so the lightest group comes first.
+        heap: List[List[int]] = [[0, 0, group_index] for group_index in range(num_groups)]
+        heapify(heap)
+        group_indexes: List[List[int]] = [[] for _ in range(num_groups)]
+
+        by_size: List[int] = sorted(range(len(item_list)), key=lambda index: item_sizes[index], reverse=True)
+        for item_index in by_size:
+            lightest: List[int] = heappop(heap)
+            group_indexes[lightest[2]].append(item_index)
+            lightest[0] += item_sizes[item_index]
+            lightest[1] += 1
+            # Full groups are not put back on the heap.
+            if lightest[1] < max_group_size:
+                heappush(heap, lightest)
+
+        return [[item_list[index] for index in sorted(indexes)] for indexes in group_indexes]
+
+    # pylint: disable=too-many-arguments,too-many-locals
     async def do_subgroups_in_parallel(self, file_groups: List[List[str]], basis_args: Dict[str, Any],
-                                       sly_data: Dict[str, Any], tools_to_use: Dict[str, str]) -> str:
+                                       sly_data: Dict[str, Any], tools_to_use: Dict[str, str], *,
+                                       max_parallel_groups: int = MAX_PARALLEL_GROUPS,
+                                       backup_fraction: float = BACKUP_FRACTION) -> str:
         """
         Call rough_substructure and create_networks on each group in parallel
         The results of the individually created group networks will be in sly_data's "group_results" key.
@@ -154,84 +385,245 @@ class CoarseGrouping(BranchActivation, CodedTool):
                 by the agent chain implementation and the coded_tool implementation
                 adding the data is not invoke()-ed more than once.
         :param tools_to_use: A dictionary of tools to use
+        :param max_parallel_groups: The maximum number of file groups to have in flight at once
+        :param backup_fraction: The fraction of file groups which must be done with rough_substructure
+                    before the remaining ones are given backup calls.  1.0 or more turns this off.
         :return: A list of string results from all the parallel tasks.
         """
-        logger: Logger = getLogger(self.__class__.__name__)
+        # Now create tasks that will call rough_substructure and create_networks on each group
+        # in parallel with data appropriate for the group.
+        # The results of the mid- to leaf-level group networks will be in sly_data's group_results.
+        tasks: List[Task] = []
+        _LOGGER.info("Processing %d file groups", len(file_groups))
 
-        # Now create coroutines that will call rough_substructure on each group with data appropriate for the group
-        coroutines: List[Future] = []
-        logger.info("Processing %d file groups", len(file_groups))
-        for file_group in file_groups:
+        # Allocate a group_results slot for every file group up front.
+        # No tasks are running yet, so there is no need to go through new_group() and its lock.
+        sly_data["group_results"] = [{} for _ in file_groups]
+        sly_data["num_groups"] = len(file_groups)
 
-            # Create a tool args dict specific to the iteration
-            tool_args: Dict[str, Any] = deepcopy(basis_args)
-            tool_args["file_list"] = file_group
+        if len(file_groups) == 1:
+            # Small corpora fit in a single group. Skip the fan-out machinery and just do it.
+            tool_args: Dict[str, Any] = {**basis_args, "file_list": file_groups[0]}
+            result: str = await self.do_one_subgroup_in_parallel(0, tool_args, sly_data, tools_to_use)
+            return [result]
 
-            group_number: int = await self.new_group(sly_data)
+        # Bound how many file groups are worked on at once
+        semaphore: Semaphore = Semaphore(max(1, max_parallel_groups))
 
-            sly_data["num_groups"] = len(sly_data["group_results"])
+        monitor: _StragglerMonitor = None
+        if backup_fraction < 1.0:
+            monitor = _StragglerMonitor(len(file_groups), backup_fraction)
 
-            # Add a coroutine for the file group to the list
-            coroutines.append(self.do_one_subgroup_in_parallel(group_number, tool_args, sly_data, tools_to_use))
+        async with TaskGroup() as task_group:
+            for group_number, file_group in enumerate(file_groups):
 
-        # Call the rough_substructure and create_networks tools on each group in parallel
-        # The results of the mid- to leaf-level group networks will be in sly_data's group_results.
-        results: List[str] = await gather(*coroutines)
+                # Create a tool args dict specific to the iteration
+                tool_args: Dict[str, Any] = {**basis_args, "file_list": file_group}
+
+                # Start a task for the file group
+                tasks.append(task_group.create_task(self.do_one_subgroup_bounded(semaphore, group_number, tool_args,
+                                                                                 sly_data, tools_to_use,
+                                                                                 monitor=monitor)))
+
+        # Leaving the TaskGroup context means all tasks are done
+        results: List[str] = [task.result() for task in tasks]
 
         return results
 
+    # pylint: disable=too-many-arguments
+    async def do_one_subgroup_bounded(self, semaphore: Semaphore, group_number: int,
+                                      tool_args: Dict[str, Any],
+                                      sly_data: Dict[str, Any],
+                                      tools_to_use: Dict[str, str], *,
+                                      monitor: _StragglerMonitor = None) -> str:
+        """
+        Call do_one_subgroup_in_parallel() once the semaphore lets this file group through.
+        :param semaphore: The Semaphore bounding the number of file groups in flight
+        :param group_number: The index of the file group being processed
+        :param tool_args: The basis arguments to be passed to rough_substructure and create_networks
+        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
+        :param tools_to_use: The dictionary of tools to be called
+        :param monitor: The optional _StragglerMonitor deciding when to issue backup rough_substructure calls
+        """
+        async with semaphore:
+            return await self.do_one_subgroup_in_parallel(group_number, tool_args, sly_data, tools_to_use,
+                                                          monitor=monitor)
+
     # pylint: disable=too-many-locals
     async def do_one_subgroup_in_parallel(self, group_number: int,
                                           tool_args: Dict[str, Any],
                                           sly_data: Dict[str, Any],
-                                          tools_to_use: Dict[str, str]) -> str:
+                                          tools_to_use: Dict[str, str], *,
+                                          monitor: _StragglerMonitor = None) -> str:
         """
         Call rough_substructure and create_networks in parallel on a single file grouping.
+        Each file group moves on to create_network as soon as its own rough_substructure is done,
+        without waiting on any other file group.
         :param group_number: The index of the file group being processed
         :param tool_args: The basis arguments to be passed to rough_substructure and create_networks
         :param sly_data: The sly_data dictionary for the instantiation of the coded tool
         :param tools_to_use: The dictionary of tools to be called
+        :param monitor: The optional _StragglerMonitor deciding when to issue backup rough_substructure calls
         """
-        logger: Logger = getLogger(self.__class__.__name__)
+        file_list: List[str] = tool_args.get("file_list")
+
+        # Only pay for pretty-printing the file list when it will actually be logged
+        if _LOGGER.isEnabledFor(INFO):
+            _LOGGER.info("Processing group %d with list: %s", group_number, CreateNetworks.pretty_json(file_list))
+
+        one_grouping: Dict[str, Any] = await self.rough_one_subgroup(tool_args, sly_data, tools_to_use,
+                                                                     monitor=monitor)
+        if monitor is not None:
+            monitor.finished_one()
+        if one_grouping is None:
+            return await self.split_up_list(group_number, tool_args, sly_data, tools_to_use)
 
+        return await self.network_one_subgroup(group_number, one_grouping, tool_args, sly_data, tools_to_use)
+
+    async def rough_one_subgroup(self, tool_args: Dict[str, Any],
+                                 sly_data: Dict[str, Any],
+                                 tools_to_use: Dict[str, str], *,
+                                 monitor: _StragglerMonitor = None) -> Dict[str, Any]:
+        """
+        Call rough_substructure on a single file grouping until its output meets the grouping constraints.
+        :param tool_args: The basis arguments to be passed to rough_substructure
+        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
+        :param tools_to_use: The dictionary of tools to be called
+        :param monitor: The optional _StragglerMonitor deciding when to issue backup rough_substructure calls
+        :return: The parsed grouping json, or None if the constraints were not met after MAX_RETRIES tries.
+        """
         # Get tools we will call from role-keys
         rough_substructure: str = tools_to_use.get("rough_substructure", "rough_substructure")
-        create_network: str = tools_to_use.get("create_network", "create_network")
 
         file_list: List[str] = tool_args.get("file_list")
 
-        logger.info("Processing group %d with list: %s", group_number, dumps(file_list, indent=4, sort_keys=True))
-
-        # Call rough_substructure
-        done: bool = False
-        retries_left: int = self.MAX_RETRIES
-        while not done:
-            one_grouping_json_str: str = await self.use_tool(tool_name=rough_substructure,
-                                                             tool_args=tool_args,
-                                                             sly_data=sly_data)
-            one_grouping: Dict[str, Any] = JsonStructureParser().parse_structure(one_grouping_json_str)
+        for _ in range(self.MAX_RETRIES):
+            one_grouping_json_str: str = await self.use_tool_with_backup(rough_substructure, tool_args,
+                                                                         sly_data, monitor)
+            # Parsing is CPU-bound, so do it off the EventLoop to let I/O for other subgroups proceed.
+            one_grouping: Dict[str, Any] = await to_thread(_JSON_PARSERS.parser.parse_structure,
+                                                           one_grouping_json_str)
             groups: List[Dict[str, Any]] = None
             if one_grouping is not None:
                 groups = one_grouping.get("groups")
 
-            done = self.verify_grouping_constraints(groups, file_list)
+            if self.verify_grouping_constraints(groups, file_list):
+                return one_grouping
 
-            if not done:
-                retries_left -= 1
-                if retries_left <= 0:
-                    logger.info("Constraints not met after %d retries.", self.MAX_RETRIES)
-                    done = True
+        _LOGGER.info("Constraints not met after %d retries.", self.MAX_RETRIES)
+        return None
 
-        if retries_left <= 0:
-            return await self.split_up_list(group_number, tool_args, sly_data, tools_to_use)
+    async def use_tool_with_backup(self, tool_name: str, tool_args: Dict[str, Any],
+                                   sly_data: Dict[str, Any], monitor: _StragglerMonitor = None) -> str:
+        """
+        Call a tool, and if the monitor says this call has become a straggler,
+        issue a duplicate backup call and take whichever of the two succeeds first.
+        Only use this for tools that are safe to call twice.
+        :param tool_name: The name of the tool to call
+        :param tool_args: The arguments to pass to the tool
+        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
+        :param monitor: The optional _StragglerMonitor.  When None, the tool is simply called once.
+        :return: The output of the first call to the tool that succeeds
+        """
+        if monitor is None:
+            return await self.use_tool_bounded(tool_name, tool_args, sly_data)
+
+        start_times: List[float] = []
+        call: Task = create_task(self.use_tool_bounded(tool_name, tool_args, sly_data, start_times=start_times))
+        tasks: List[Task] = [call]
+        try:
+            if await monitor.is_straggler(call, start_times):
+                _LOGGER.info("Issuing backup %s call for a straggling group", tool_name)
+                tasks.append(create_task(self.use_tool_bounded(tool_name, tool_args, sly_data)))
+            result: str = await self.first_success(tasks)
+        finally:
+            # Don't leave the slower call running, even when we are cancelled ourselves.
+            for task in tasks:
+                task.cancel()
+
+        monitor.finished_call(monotonic() - start_times[0])
+        return result
+
+    @staticmethod
+    async def first_success(tasks: List[Task]) -> str:
+        """
+        :param tasks: The Tasks doing the same call
+        :return: The result of the first of the tasks to succeed.
+                If they all fail, the exception of the first of the tasks is raised.
+        """
+        pending: Set[Task] = set(tasks)
+        while pending:
+            done: Set[Task] = None
+            done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if pending:
+                _LOGGER.info("A duplicate call failed. Waiting on the other one.")
+
+        return tasks[0].result()
+
+    async def use_tool_bounded(self, tool_name: str, tool_args: Dict[str, Any], sly_data: Dict[str, Any], *,
+                               start_times: List[float] = None) -> str:
+        """
+        Call a tool once the sly_data's "tool_semaphore" lets the call through.
+        :param tool_name: The name of the tool to call
+        :param tool_args: The arguments to pass to the tool
+        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
+        :param start_times: An optional list to append the time the tool call starts to,
+                    after any wait on the semaphore
+        :return: The output of the tool
+        """
+        semaphore: Semaphore = sly_data.get("tool_semaphore")
+        if semaphore is None:
+            self.note_start(start_times)
+            return await self.use_tool(tool_name=tool_name, tool_args=tool_args, sly_data=sly_data)
+
+        async with semaphore:
+            self.note_start(start_times)
+            return await self.use_tool(tool_name=tool_name, tool_args=tool_args, sly_data=sly_data)
+
+    @staticmethod
+    def note_start(start_times: List[float]):
+        """
+        :param start_times: An optional list to append the current time to
+        """
+        if start_times is not None:
+            start_times.append(monotonic())
+
+    # pylint: disable=too-many-arguments
+    async def network_one_subgroup(self, group_number: int,
+                                   one_grouping: Dict[str, Any],
+                                   tool_args: Dict[str, Any],
+                                   sly_data: Dict[str, Any],
+                                   tools_to_use: Dict[str, str]) -> str:
+        """
+        Call create_network on a single file grouping that rough_substructure has structured.
+        :param group_number: The index of the file group being processed
+        :param one_grouping: The grouping json from rough_substructure
+        :param tool_args: The basis arguments that were passed to rough_substructure
+        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
+        :param tools_to_use: The dictionary of tools to be called
+        :return: The output of create_network
+        """
+        # Get tools we will call from role-keys
+        create_network: str = tools_to_use.get("create_network", "create_network")
 
-        # Call create_network
         create_network_args: Dict[str, Any] = {
             "files_directory": tool_args.get("files_directory"),
             "grouping_json": one_grouping,
             "group_number": group_number
         }
-        result: str = await self.use_tool(tool_name=create_network, tool_args=create_network_args, sly_data=sly_data)
+        result: str = await self.use_tool_bounded(create_network, create_network_args, sly_data)
+
+        # create_network publishes its agent_reservations into our group's slot.
+        # Write the whole slot back by index from here so the data for the group is explicit
+        # at this layer, and so the grouping_json is kept even if create_network published nothing.
+        group_result: Dict[str, Any] = sly_data["group_results"][group_number]
+        sly_data["group_results"][group_number] = {
+            "agent_reservations": group_result.get("agent_reservations"),
+            "grouping_json": one_grouping
+        }
 
         return result
 
@@ -244,31 +636,59 @@ class CoarseGrouping(BranchActivation, CodedTool):
         :param sly_data: The sly_data dictionary for the instantiation of the coded tool
         :param tools_to_use: The dictionary of tools to be called
         """
-        logger: Logger = getLogger(self.__class__.__name__)
-
         file_list: List[str] = tool_args.get("file_list")
 
-        # Break up the list
-        num_files: int = int(len(file_list) / 2)
+        if not file_list:
+            # Nothing to group. Don't spend a rough_substructure call on an empty group.
+            return "Error: No files to split."
+
+        if len(file_list) == 1:
+            # A single file cannot be split any further, and it can only be grouped one way.
+            _LOGGER.info("Networking %s on its own", file_list[0])
+            return await self.network_one_subgroup(group_number, self.single_file_grouping(file_list[0]),
+                                                   tool_args, sly_data, tools_to_use)
+
+        # Break up the list. With at least two files, neither half is empty.
+        num_files: int = len(file_list) // 2
         group_one: List[str] = file_list[0:num_files]   # end index is not included
-        group_two: List[str] = file_list[num_files:-1]
-        logger.info("Splitting list into two groups of %d and %d", len(group_one), len(group_two))
+        group_two: List[str] = file_list[num_files:]
+        _LOGGER.info("Splitting list into two groups of %d and %d", len(group_one), len(group_two))
 
         new_group_number: int = await self.new_group(sly_data)
 
         # Do the two groups in parallel
-        coroutines: List[Future] = []
-
-        tool_args_one: Dict[str, Any] = deepcopy(tool_args)
-        tool_args_one["file_list"] = group_one
-        coroutines.append(self.do_one_subgroup_in_parallel(group_number, tool_args_one, sly_data, tools_to_use))
-
-        tool_args_two: Dict[str, Any] = deepcopy(tool_args)
-        tool_args_two["file_list"] = group_two
-        coroutines.append(self.do_one_subgroup_in_parallel(new_group_number, tool_args_two, sly_data, tools_to_use))
-
-        result: List[str] = await gather(*coroutines)
-        return str(result)
+        tool_args_one: Dict[str, Any] = {**tool_args, "file_list": group_one}
+        tool_args_two: Dict[str, Any] = {**tool_args, "file_list": group_two}
+        async with TaskGroup() as task_group:
+            task_one: Task = task_group.create_task(self.do_one_subgroup_in_parallel(group_number, tool_args_one,
+                                                                                     sly_data, tools_to_use))
+            task_two: Task = task_group.create_task(self.do_one_subgroup_in_parallel(new_group_number, tool_args_two,
+                                                                                     sly_data, tools_to_use))
+
+        result: List[str] = [task_one.result(), task_two.result()]
+        # A JSON array rather than a Python list repr, so that it is parseable downstream
+        return dumps(result)
+
+    @staticmethod
+    def single_file_grouping(file_name: str) -> Dict[str, Any]:
+        """
+        :param file_name: The name of the file
+        :return: A grouping json of a single group for the single file, in the form rough_substructure gives
+        """
+        snake_name: str = CreateNetworks.filter_name(file_name)
+        description: str = f"The content of {file_name}"
+        grouping: Dict[str, Any] = {
+            "name": snake_name,
+            "description": description,
+            "groups": [
+                {
+                    "name": snake_name,
+                    "description": description,
+                    "files": {file_name: snake_name}
+                }
+            ]
+        }
+        return grouping
 
     def verify_grouping_constraints(self, groups: List[Dict[str, Any]], file_list: List[str]) -> bool:
         """
@@ -278,22 +698,20 @@ class CoarseGrouping(BranchActivation, CodedTool):
         :return: True if the constraints are met, False otherwise
         """
 
-        logger: Logger = getLogger(self.__class__.__name__)
-
         if groups is None:
-            logger.info("Constraints not met. groups is None.")
+            _LOGGER.info("Constraints not met. groups is None.")
             return False
 
         # Verify the grouping constraints.
         if len(groups) > self.MAX_GROUP_SIZE:
-            logger.info("Constraints not met. Too many groups (%d).", len(groups))
+            _LOGGER.info("Constraints not met. Too many groups (%d).", len(groups))
             return False
 
         # Verify the file-per-group constraints.
         for group in groups:
             files: Dict[str, Any] = group.get("files")
             if len(files) > self.MAX_FILES_PER_GROUP:
-                logger.info("Too many files in group (%d). Constraints not met.", len(files))
+                _LOGGER.info("Too many files in group (%d). Constraints not met.", len(files))
                 return False
 
         # Verify that every file is in one group
@@ -305,108 +723,77 @@ class CoarseGrouping(BranchActivation, CodedTool):
                     found = True
                     break
             if not found:
-                logger.info("Constraints not met. File %s not found in any group", file)
+                _LOGGER.info("Constraints not met. File %s not found in any group", file)
                 return False
 
         return True
 
-    def prepare_agent_reservations(self, sly_data: Dict[str, Any],
-                                   new_group_numbers: List[int] = None) -> List[Dict[str, Any]]:
+    async def process_group_results(self, sly_data: Dict[str, Any], tools_to_use: Dict[str, Any],
+                                    new_group_numbers: List[int] = None) -> str:
         """
-        Put the list of agent_reservations from the parallel calls to create_network
-        into a single list.
+        Integrate the results from all the calls to the rough_substructure and create_network tools
+        into a single whole.
+
         :param sly_data: The sly_data dictionary for the instantiation of the coded tool
                         where we will put our results.  We expect "group_results" to have
                         already been filled in.
+        :param tools_to_use: A dictionary of tools to use
         :param new_group_numbers: A list of new group numbers to process.  If None then will process all.
-        :return: A list of the new mid-level networks that will need to be grouped together
+        :return: String output to return as tool output
         """
-
         group_results: List[Dict[str, Any]] = sly_data.get("group_results")
 
-        use_group_numbers: List[int] = new_group_numbers
+        use_group_numbers: Set[int] = set(range(len(group_results)))
+        if new_group_numbers is not None:
+            use_group_numbers = set(new_group_numbers)
 
-        # Put the list of agent_reservations from each group into a single list
-        mid_level_networks: List[Dict[str, Any]] = []
-        for group_number in use_group_numbers:
+        # Collect every grouping_json, then the agent_reservations of the new groups.
+        grouping_json_list: List[Dict[str, Any]] = [group_result.get("grouping_json")
+                                                    for group_result in group_results]
+        reservation_infos: List[List[Dict[str, Any]]] = []
+        mid_level_groups: List[Dict[str, Any]] = []
+        for group_number in sorted(use_group_numbers):
 
             group_result: Dict[str, Any] = group_results[group_number]
             reservation_info: List[Dict[str, Any]] = group_result.get("agent_reservations")
-
-            logger: Logger = getLogger(self.__class__.__name__)
             if not reservation_info:
-                logger.warning("No agent_reservations found for group %d", group_number)
+                _LOGGER.warning("No agent_reservations found for group %d", group_number)
                 continue
 
             if not isinstance(reservation_info, list):
-                logger.warning("agent_reservations found for group %d is not a list", group_number)
+                _LOGGER.warning("agent_reservations found for group %d is not a list", group_number)
                 continue
 
-            # All the sub-agent networks will be the first items in the list, except for the last guy
-            sly_data["agent_reservations"].extend(reservation_info[:-1])
-
-            # The last one in the list will be the entry-point network, by convention
-            mid_level_networks.append(reservation_info[-1])
-
-        # Add the mid-level networks to the end of the list
-        sly_data["agent_reservations"].extend(mid_level_networks)
-
-        return mid_level_networks
-
-    async def process_group_results(self, sly_data: Dict[str, Any], tools_to_use: Dict[str, Any],
-                                    new_group_numbers: List[int] = None) -> str:
-        """
-        Integrate the results from all the calls to the rough_substructure and create_network tools
-        into a single whole.
-
-        :param sly_data: The sly_data dictionary for the instantiation of the coded tool
-                        where we will put our results.  We expect "group_results" to have
-                        already been filled in.
-        :param tools_to_use: A dictionary of tools to use
-        :param new_group_numbers: A list of new group numbers to process.  If None then will process all.
-        :return: String output to return as tool output
-        """
-        group_results: List[Dict[str, Any]] = sly_data.get("group_results")
-
-        use_group_numbers: List[int] = new_group_numbers
-        if use_group_numbers is None:
-            use_group_numbers = list(range(len(group_results)))
+            reservation_infos.append(reservation_info)
 
-        # Contains only new mid-level networks
-        mid_level_networks: List[Dict[str, Any]] = self.prepare_agent_reservations(sly_data, use_group_numbers)
+            # The last one in the list will be the entry-point network for the group, by convention.
+            # Keep it together with the grouping_json that describes it.
+            mid_level_group: Dict[str, Any] = {
+                "reservation_dict": reservation_info[-1],
+                "grouping_json": grouping_json_list[group_number]
+            }
+            mid_level_groups.append(mid_level_group)
 
         # Use the aa_ prefix so that when keys come out in alphabetical order
         # the agent_reservations info will be the last thing spit out on command-line clients,
         # which will make the user's life easier in terms of finding the main network to call.
-        grouping_json_list: List[Dict[str, Any]] = []
-        for group_result in group_results:
-            grouping_json_list.append(group_result.get("grouping_json"))
         sly_data["aa_grouping_json"] = grouping_json_list
 
-        if len(mid_level_networks) > 1:
-
-            # Create a master list of mid-level group information
-            mid_level_groups: List[Dict[str, Any]] = []
-            mid_level_network: Dict[str, Any] = None
-            for index, mid_level_network in enumerate(mid_level_networks):
-
-                group_number: int = use_group_numbers[index]
-                group_result: Dict[str, Any] = group_results[group_number]
-
-                mid_level_group: Dict[str, Any] = {
-                    "reservation_dict": mid_level_network,
-                    "grouping_json": group_result.get("grouping_json")
-                }
-                mid_level_groups.append(mid_level_group)
+        # All the sub-agent networks will be the first items in each list, except for the last guy.
+        # Put them all into the single list in one go, with the new mid-level networks at the end.
+        sub_networks: Iterator[Dict[str, Any]] = chain.from_iterable(info[:-1] for info in reservation_infos)
+        mid_level_networks: Iterator[Dict[str, Any]] = (info[-1] for info in reservation_infos)
+        sly_data["agent_reservations"].extend(chain(sub_networks, mid_level_networks))
 
+        if len(mid_level_groups) > 1:
             # Create groupings of groups
             mid_level_groupings: List[List[Dict[str, Any]]] = self.create_groups(mid_level_groups, self.MAX_GROUP_SIZE)
             await self.create_groups_of_groups(mid_level_groupings, sly_data, tools_to_use)
 
         # Put the list of agent_reservations from each group into a single list
-        reservation_info: List[Dict[str, Any]] = sly_data.get("agent_reservations")
+        all_reservations: List[Dict[str, Any]] = sly_data.get("agent_reservations")
 
-        output: str = CreateNetworks.create_output(reservation_info)
+        output: str = CreateNetworks.create_output(all_reservations)
         return output
 
     async def create_groups_of_groups(self, mid_level_groupings: List[List[Dict[str, Any]]],
@@ -420,49 +807,40 @@ class CoarseGrouping(BranchActivation, CodedTool):
         """
         create_network: str = tools_to_use.get("create_network", "create_network")
 
-        # Assembles a list of coroutines to do in parallel
-        coroutines: List[Future] = []
         new_group_numbers: List[int] = []
 
-        mid_level_grouping: List[Dict[str, Any]] = None
-        for mid_level_grouping in mid_level_groupings:
-
-            # Accumulate groups for a higher-level network descriptions
-            high_level_groups: List[Dict[str, Any]] = []
-
-            mid_level_group: Dict[str, Any] = None
-            for mid_level_group in mid_level_grouping:
-
-                reservation_dict: Dict[str, Any] = mid_level_group.get("reservation_dict")
-                grouping_json: Dict[str, Any] = mid_level_group.get("grouping_json")
-
-                new_group: Dict[str, Any] = {
-                    "description": grouping_json.get("description"),
-                    "name": grouping_json.get("name"),
-                    "reservation": reservation_dict
+        # Start each create_network call as soon as its arguments are ready,
+        # and run them all in parallel.
+        async with TaskGroup() as task_group:
+            mid_level_grouping: List[Dict[str, Any]] = None
+            for mid_level_grouping in mid_level_groupings:
+
+                # Accumulate groups for a higher-level network descriptions
+                high_level_groups: List[Dict[str, Any]] = [
+                    {
+                        "description": mid_level_group.get("grouping_json").get("description"),
+                        "name": mid_level_group.get("grouping_json").get("name"),
+                        "reservation": mid_level_group.get("reservation_dict")
+                    }
+                    for mid_level_group in mid_level_grouping
+                ]
+
+                high_level_grouping: Dict[str, Any] = {
+                    "name": "group_of_groups",              # DEF - Can get an agent to do better
+                    "description": "Grouping of groups",    # DEF - Can get an agent to do better
+                    "groups": high_level_groups
                 }
-                high_level_groups.append(new_group)
-
-            high_level_grouping: Dict[str, Any] = {
-                "name": "group_of_groups",              # DEF - Can get an agent to do better
-                "description": "Grouping of groups",    # DEF - Can get an agent to do better
-                "groups": high_level_groups
-            }
 
-            new_group_number: int = await self.new_group(sly_data)
-            new_group_numbers.append(new_group_number)
+                new_group_number: int = await self.new_group(sly_data)
+                new_group_numbers.append(new_group_number)
 
-            # Prepare call to create_network
-            create_network_args: Dict[str, Any] = {
-                "files_directory": "",
-                "grouping_json": high_level_grouping,
-                "group_number": new_group_number
-            }
-
-            coroutines.append(self.use_tool(tool_name=create_network, tool_args=create_network_args, sly_data=sly_data))
-
-        # Run all the coroutines in parallel
-        await gather(*coroutines)
+                # Prepare call to create_network
+                create_network_args: Dict[str, Any] = {
+                    "files_directory": "",
+                    "grouping_json": high_level_grouping,
+                    "group_number": new_group_number
+                }
+                task_group.create_task(self.use_tool_bounded(create_network, create_network_args, sly_data))
 
         # Recurse to process the results.
         results: str = await self.process_group_results(sly_data, tools_to_use, new_group_numbers)
@@ -492,7 +870,6 @@ class CoarseGrouping(BranchActivation, CodedTool):
             sly_data["group_results"].append({})
             sly_data["num_groups"] = new_group_number + 1
 
-        logger: Logger = getLogger(self.__class__.__name__)
-        logger.info("Created new group %d", new_group_number)
+        _LOGGER.info("Created new group %d", new_group_number)
 
         return new_group_number
@@ -13,15 +13,19 @@
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 from asyncio import Event
-from copy import deepcopy
-from json import dumps
+from asyncio import gather
+from asyncio import to_thread
+from functools import lru_cache
 from logging import getLogger
+from logging import INFO
 from logging import Logger
+from os import stat_result
 from pathlib import Path
 
-from aiofiles import open as aio_open
+import orjson
 
 from leaf_common.config.file_of_class import FileOfClass
 from leaf_common.persistence.easy.easy_hocon_persistence import EasyHoconPersistence
@@ -34,7 +38,54 @@ from neuro_san.internals.graph.filters.dictionary_common_defs_config_filter impo
 from neuro_san.internals.reservations.reservation_dictionary_converter import ReservationDictionaryConverter
 
 
-class CreateNetworks(CodedTool):
+def _to_json_blob(obj: Any) -> bytes:
+    """
+    :param obj: The JSON-serializable object to keep for cloning
+    :return: The object serialized as JSON bytes for _from_json_blob()
+    """
+    return orjson.dumps(obj)
+
+
+def _from_json_blob(blob: bytes) -> Any:
+    """
+    :param blob: A blob from _to_json_blob()
+    :return: A fresh copy of the object which was serialized
+    """
+    return orjson.loads(blob)
+
+
+# Maximum number of content files kept in memory by CreateNetworks
+CONTENT_CACHE_SIZE: int = 256
+
+
+@lru_cache(maxsize=CONTENT_CACHE_SIZE)
+def _read_content_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    """
+    Read the whole of a content file, remembering the result.
+    The mtime_ns and size are only there to be part of the cache key,
+    so a file which changes on disk is read again.
+    The cache is bounded by the number of files, not their size, so large documents
+    can stay in memory for the life of the process.
+    :param path_str: Full path to the content file
+    :param mtime_ns: The modification time of the file in nanoseconds
+    :param size: The size of the file in bytes
+    :return: The content of the file. Exceptions are raised to the caller and are not cached.
+    """
+    _ = mtime_ns, size
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+def _read_content(filepath: Path) -> str:
+    """
+    This does blocking file system calls, so call it off the EventLoop.
+    :param filepath: The path to the content file
+    :return: The content of the file, from the cache when the file has not changed since it was last read
+    """
+    file_stat: stat_result = filepath.stat()
+    return _read_content_cached(str(filepath), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+class CreateNetworks(CodedTool):  # pylint: disable=too-many-public-methods
     """
     CodedTool implementation that creates a single agent network that processes
     a deep_rag grouping of groups.  This can include the front-man for the entire
@@ -46,33 +97,78 @@ class CreateNetworks(CodedTool):
 
     We would need to get fancier with the agent network that feeds this tool
     in order to have multiple layers of groups. Not there yet.
+
+    Per-invocation data like the grouping_json and files_directory is passed along
+    through method arguments rather than kept on the instance, so that concurrent
+    invocations on the same instance do not stomp on each other.
     """
 
     TEMPLATE_FRONT_MAN_INDEX: int = 0
     ONE_HOUR: float = 60 * 60
     LIFETIME: float = ONE_HOUR
+    # Only used for its make_replacements(), which keeps no state.
+    STRING_FILTER: StringCommonDefsConfigFilter = StringCommonDefsConfigFilter()
+
+    # Template data shared by all instances. Filled in by load_templates().
+    network_template: Dict[str, Any] = None
+    network_skeleton_json: bytes = None
+    aaosa_defs: Dict[str, Any] = None
+    aaosa_replacements: Dict[str, Any] = None
+    aaosa_dict_replacements: Dict[str, Any] = None
+    front_man_plan: Tuple[bytes, List[Tuple[Tuple[Any, ...], str]]] = None
+    content_plan: Tuple[bytes, List[Tuple[Tuple[Any, ...], str]]] = None
 
     def __init__(self):
         """
         Constructor
         """
-        # Only want to do these things once.
+        self.logger: Logger = getLogger(self.__class__.__name__)
+
+        # Only want to do these things once per process.
+        if CreateNetworks.network_template is None:
+            self.load_templates()
+
+    def load_templates(self):
+        """
+        Load the templates from their hocon files and prepare them for use.
+        These never change, so the results are kept on the class to be shared by all instances.
+        """
         persistence = EasyHoconPersistence()
         file_of_class = FileOfClass(__file__)
-        template_file: str = file_of_class.get_file_in_basis("group_template.hocon")
-        self.network_template: Dict[str, Any] = persistence.restore(file_reference=template_file)
 
         aaosa_file: str = file_of_class.get_file_in_basis("../../registries/aaosa_basic.hocon")
-        self.aaosa_defs: Dict[str, Any] = persistence.restore(file_reference=aaosa_file)
-
-        self.logger: Logger = getLogger(self.__class__.__name__)
-
-        # Stuff that gets filled in by args upon ainvoke() call
-        self.grouping_json: Dict[str, Any] = {}
-        self.files_directory: str = None
+        CreateNetworks.aaosa_defs = persistence.restore(file_reference=aaosa_file)
+        CreateNetworks.aaosa_replacements = {
+            "aaosa_command": self.aaosa_defs.get("aaosa_command"),
+            "aaosa_instructions": self.aaosa_defs.get("aaosa_instructions")
+        }
+        CreateNetworks.aaosa_dict_replacements = {
+            "aaosa_call": self.aaosa_defs.get("aaosa_call"),
+        }
 
-        # Stuff that gets constructed which is commonly accessible
-        self.name_to_network: Dict[str, str] = {}
+        template_file: str = file_of_class.get_file_in_basis("group_template.hocon")
+        network_template: Dict[str, Any] = persistence.restore(file_reference=template_file)
+        template_tools: List[Dict[str, Any]] = network_template.get("tools")
+
+        # Every network is the template with its own front man and without the content node template
+        # in its tools, so only keep the rest of the template to be copied.
+        # It is plain JSON, so fresh copies of it are cheaper to parse from a pre-serialized blob
+        # than to deepcopy().
+        skeleton_tools: List[Dict[str, Any]] = template_tools[:-1]
+        skeleton_tools[self.TEMPLATE_FRONT_MAN_INDEX] = None
+        CreateNetworks.network_skeleton_json = _to_json_blob({**network_template, "tools": skeleton_tools})
+
+        # The front man and content node templates are the same for every network.
+        # Do the constant AAOSA filtering on them once, and remember where their per-agent strings go
+        # so that each new agent only needs those few strings filled in.
+        CreateNetworks.front_man_plan = \
+            self.make_substitution_plan(template_tools[self.TEMPLATE_FRONT_MAN_INDEX],
+                                        ("{one_group}", "{group_description}", "{structure_description}", "{title}"))
+        CreateNetworks.content_plan = \
+            self.make_substitution_plan(template_tools[-1], ("{one_content_file}", "{content}"))
+
+        # Set this last, as it marks the loading as done.
+        CreateNetworks.network_template = network_template
 
     async def async_invoke(self, args: Dict[str, Any], sly_data: Dict[str, Any]) -> Any:
         """
@@ -105,10 +201,10 @@ class CreateNetworks(CodedTool):
                 adding the data is not invoke()-ed more than once.
         :return: A return value that goes into the chat stream.
         """
-        # Get most args as members
+        # Get most args as locals to pass along
         empty: Dict[str, Any] = {}
-        self.grouping_json: Dict[str, Any] = args.get("grouping_json", empty)
-        self.files_directory: str = args.get("files_directory")
+        grouping_json: Dict[str, Any] = args.get("grouping_json", empty)
+        files_directory: str = args.get("files_directory")
 
         # Main assembly of all networks we will deploy
         reservationist: Reservationist = args.get("reservationist")
@@ -119,12 +215,13 @@ class CreateNetworks(CodedTool):
         # be grouped together.  This case doesn't really care about files at all, only reservations.
         # The second takes a grouping_json whose leaf nodes are leaf document references that should
         # be grouped together.
-        if self.files_directory is None or len(self.files_directory) == 0:
+        if files_directory is None or len(files_directory) == 0:
             # Shortcut for creating group of groups that have not files but already have reservations.
-            deployments = await self.assemble_group_of_groups(reservationist)
+            deployments = await self.assemble_group_of_groups(reservationist, grouping_json)
         else:
-            # Assemble the deployments
-            deployments = await self.assemble_deployments(reservationist)
+            # Assemble the deployments.
+            # Make the directory a Path just once, rather than for every content file.
+            deployments = await self.assemble_deployments(reservationist, grouping_json, Path(files_directory))
 
         # Deploy the reservations with confirmation event
         # If you don't really need to wait until the new agent(s) has been deployed
@@ -153,7 +250,7 @@ class CreateNetworks(CodedTool):
         group_number: int = int(args.get("group_number"))
         sly_data["group_results"][group_number] = {
             "agent_reservations": reservation_info,
-            "grouping_json": self.grouping_json
+            "grouping_json": grouping_json
         }
 
         output: str = self.create_output(reservation_info)
@@ -177,13 +274,17 @@ class CreateNetworks(CodedTool):
                       f"Hurry, it's only available for {entry_lifetime} seconds."
         return output
 
-    async def assemble_deployments(self, reservationist: Reservationist) -> Dict[Reservation, Dict[str, Any]]:
+    async def assemble_deployments(self, reservationist: Reservationist, grouping_json: Dict[str, Any],
+                                   files_directory: Path) -> Dict[Reservation, Dict[str, Any]]:
         """
         Create all the networks that are to be deployed together.
+        :param reservationist: The reservationist for this coded tool
+        :param grouping_json: The grouping_json describing the networks to create
+        :param files_directory: The directory where the content files can be found
         """
 
         # Get the list of the groups
-        groups: List[Dict[str, Any]] = self.grouping_json.get("groups")
+        groups: List[Dict[str, Any]] = grouping_json.get("groups")
 
         # Make a dictionary of name -> group
         name_to_group: Dict[str, Dict[str, Any]] = {}
@@ -192,117 +293,202 @@ class CreateNetworks(CodedTool):
             name_to_group[name] = group
 
         # Create the leaf networks and make Reservations for them
-        name_to_network: Dict[str, Dict[str, Any]] = await self.make_leaf_networks(name_to_group)
-        deployments: Dict[Reservation, Dict[str, Any]] = await self.reserve_leaf_networks(reservationist,
-                                                                                          name_to_network)
+        name_to_network: Dict[str, Dict[str, Any]] = await self.make_leaf_networks(name_to_group, grouping_json,
+                                                                                   files_directory)
+        # The group network's own reservation does not depend on the leaf ones, so make them all at once.
+        deployments: Dict[Reservation, Dict[str, Any]] = None
+        group_network_reservation: Reservation = None
+        deployments, group_network_reservation = await gather(
+            self.reserve_leaf_networks(reservationist, name_to_network),
+            self.reserve_group_network(reservationist, grouping_json))
 
         group_reservations: List[Reservation] = list(deployments.keys())
 
-        group_network_reservation: Dict[Reservation, Dict[str, Any]] = None
-        group_network_reservation = await self.assemble_group_network(group_reservations, reservationist)
-        deployments.update(group_network_reservation)
+        # The group network goes last, as it is the main entry point.
+        deployments.update(self.assemble_group_network(group_reservations, group_network_reservation,
+                                                       grouping_json))
 
         return deployments
 
-    async def assemble_group_network(self, group_reservations: List[Reservation],
-                                     reservationist: Reservationist) -> Dict[Reservation, Dict[str, Any]]:
+    async def reserve_group_network(self, reservationist: Reservationist,
+                                    grouping_json: Dict[str, Any]) -> Reservation:
         """
-        Assemble the group network
-        :param group_reservations: The list of group reservations for the group network
-        :return: A dictionary of reservation -> network for the group network.
+        Make the reservation for the group network
+        :param reservationist: The reservationist for this coded tool
+        :param grouping_json: The grouping_json describing the group network
+        :return: The reservation for the group network
         """
-
-        # Use the reservations as tools in the top-level group network
-        group_network: Dict[str, Any] = self.make_group_network(group_reservations)
         # Filter names to change spaces to underscores because tool names don't like spaces.
         # Reduces errors.
-        filtered_name: str = self.grouping_json.get("name")
+        filtered_name: str = grouping_json.get("name")
         filtered_name = self.filter_name(filtered_name)
         reservation: Reservation = await reservationist.reserve(lifetime_in_seconds=self.LIFETIME,
                                                                 prefix=filtered_name)
+        return reservation
+
+    def assemble_group_network(self, group_reservations: List[Reservation],
+                               reservation: Reservation,
+                               grouping_json: Dict[str, Any]) -> Dict[Reservation, Dict[str, Any]]:
+        """
+        Assemble the group network
+        :param group_reservations: The list of group reservations for the group network
+        :param reservation: The reservation for the group network itself from reserve_group_network()
+        :param grouping_json: The grouping_json describing the group network
+        :return: A dictionary of reservation -> network for the group network.
+        """
+
+        # Use the reservations as tools in the top-level group network
+        group_network: Dict[str, Any] = self.make_group_network(group_reservations, grouping_json)
         deployment: Dict[str, Any] = {
             reservation: group_network
         }
 
         return deployment
 
-    async def make_leaf_networks(self, name_to_group: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    async def make_leaf_networks(self, name_to_group: Dict[str, Dict[str, Any]], grouping_json: Dict[str, Any],
+                                 files_directory: Path) -> Dict[str, Dict[str, Any]]:
         """
         Assumes each group is a leaf spec.
         No groups container groups yet.
+        The leaf networks are created concurrently, as each one reads its own content files.
+        :param name_to_group: A dictionary of group name -> group
+        :param grouping_json: The grouping_json the groups come from
+        :param files_directory: The directory where the content files can be found
         """
 
-        # Make a dictionary of name -> network name as we create the leaf networks
-        group_name_to_network: Dict[str, Dict[str, Any]] = {}
-        for group_name, group in name_to_group.items():
-
-            # If the group has files, then it's a leaf network
-            if group.get("files"):
-                network: Dict[str, Any] = await self.create_one_leaf_network(group)
-                group_name_to_network[group_name] = network
+        # If the group has files, then it's a leaf network
+        leaf_names: List[str] = [group_name for group_name, group in name_to_group.items() if group.get("files")]
+        networks: List[Dict[str, Any]] = await gather(*(self.create_one_leaf_network(name_to_group[group_name],
+                                                                                     grouping_json, files_directory)
+                                                        for group_name in leaf_names))
 
+        # Make a dictionary of name -> network name from the leaf networks created
+        group_name_to_network: Dict[str, Dict[str, Any]] = dict(zip(leaf_names, networks))
         return group_name_to_network
 
-    async def create_one_leaf_network(self, group: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_one_leaf_network(self, group: Dict[str, Any], grouping_json: Dict[str, Any],
+                                      files_directory: Path) -> Dict[str, Any]:
         """
         Create an agent network spec for a single leaf group, given the group description.
+        :param group: The group description from the grouping_json
+        :param grouping_json: The grouping_json the group comes from
+        :param files_directory: The directory where the content files can be found
         """
 
-        agent_spec: Dict[str, Any] = deepcopy(self.network_template)
+        # The content agents are made from the pre-filtered content node template,
+        # so the skeleton does not have one.
+        agent_spec: Dict[str, Any] = _from_json_blob(self.network_skeleton_json)
         tools: List[Dict[str, Any]] = agent_spec.get("tools")
 
-        # The last item in the tools list of the template is the template for a content node.
-        content_template: Dict[str, Any] = tools.pop()
-
-        logstr: str = dumps(group, indent=4, sort_keys=True)
-        self.logger.info("Processing group: %s", logstr)
+        # Only pay for pretty-printing the group when it will actually be logged
+        if self.logger.isEnabledFor(INFO):
+            self.logger.info("Processing group: %s", self.pretty_json(group))
 
         files: Dict[str, str] = group.get("files")
 
-        # Create each content-focused node
-        content_tools: List[str] = []
-        for file_name, tool_name in files.items():
+        # List of tools for front man, parallel to the files
+        content_tools: List[str] = [self.filter_name(tool_name) for tool_name in files.values()]
 
-            use_tool_name = self.filter_name(tool_name)
-            content_agent: Dict[str, Any] = await self.create_one_content_agent(file_name, use_tool_name,
-                                                                                content_template)
+        # Create each content-focused node, reading all the content files concurrently
+        content_agents: List[Dict[str, Any]] = await gather(*(
+            self.create_one_content_agent(file_name, use_tool_name, files_directory)
+            for file_name, use_tool_name in zip(files.keys(), content_tools)))
 
-            # Add to list of tool specs for network
-            tools.append(content_agent)
+        # Add to list of tool specs for network, in file order
+        tools.extend(content_agents)
 
-            # Add to list of tools for front man
-            content_tools.append(use_tool_name)
-
-        # Start out with the front man from the template, but replace him with what's made.
-        front_man: Dict[str, Any] = tools[self.TEMPLATE_FRONT_MAN_INDEX]
-        front_man = self.create_front_man(front_man, group, content_tools)
+        # Replace the front man from the template with what's made.
+        front_man: Dict[str, Any] = self.create_front_man(group, grouping_json, content_tools)
         # We don't need user prompts here
         del front_man["user_prompt"]
         tools[self.TEMPLATE_FRONT_MAN_INDEX] = front_man
 
         return agent_spec
 
-    async def create_one_content_agent(self, file_name: str, tool_name: str, content_template: Dict[str, Any]) \
+    async def create_one_content_agent(self, file_name: str, tool_name: str, files_directory: Path) \
             -> Dict[str, Any]:
         """
         Creates a single agent node that sponsors one section of the content
+        :param file_name: The name of the content file
+        :param tool_name: The name of the content agent
+        :param files_directory: The directory where the content file can be found
         """
-        # Asynchronously read the content of the file
-        filepath = Path(self.files_directory) / file_name
+        # Read the content of the file off the EventLoop in a single thread hop.
+        # Content files are often shared across runs on the same dataset, so unchanged ones come from a cache.
+        filepath: Path = files_directory / file_name
         self.logger.info("Reading %s", filepath)
-        async with aio_open(filepath, "r") as my_file:
-            file_content: str = await my_file.read()
+        file_content: str = await to_thread(_read_content, filepath)
 
         # Create the content agent spec by replacing strings in strategic places
-        content_agent: Dict[str, Any] = deepcopy(content_template)
         string_replacements: Dict[str, Any] = {
             "one_content_file": tool_name,
             "content": file_content,
         }
 
-        content_agent = self.filter_agent(content_agent, string_replacements)
+        content_agent: Dict[str, Any] = self.fill_substitution_plan(self.content_plan, string_replacements)
         return content_agent
 
+    def make_substitution_plan(self, agent_template: Dict[str, Any], markers: Tuple[str, ...]) \
+            -> Tuple[bytes, List[Tuple[Tuple[Any, ...], str]]]:
+        """
+        Do the constant AAOSA filtering on an agent template, and find where its per-agent strings are.
+        :param agent_template: The agent template from the network template
+        :param markers: The "{key}" markers for the per-agent string replacements
+        :return: A tuple of the pre-filtered agent template as a _to_json_blob(),
+                and the list of (path, string) sites in it containing any of the markers.
+        """
+        skeleton: Dict[str, Any] = self.filter_agent(agent_template, {})
+        return _to_json_blob(skeleton), self.find_substitution_sites(skeleton, markers)
+
+    def fill_substitution_plan(self, plan: Tuple[bytes, List[Tuple[Tuple[Any, ...], str]]],
+                               replacements: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a new agent spec from a substitution plan.
+        This gives the same result as filter_agent() on the original agent template.
+        :param plan: The substitution plan from make_substitution_plan()
+        :param replacements: The per-agent string replacements
+        :return: The new agent spec
+        """
+        # This runs for every agent made, so look up the replacement method just once.
+        make_replacements = self.STRING_FILTER.make_replacements
+
+        # Like the CommonDefs filters, first do replacements among the replacement strings themselves.
+        all_replacements: Dict[str, Any] = {**self.aaosa_replacements, **replacements}
+        use_replacements: Dict[str, Any] = {key: make_replacements(value, all_replacements)
+                                            for key, value in replacements.items()}
+
+        # Only the strings at the known sites in the pre-filtered template need filling in.
+        skeleton_json, sites = plan
+        agent_spec: Dict[str, Any] = _from_json_blob(skeleton_json)
+        for path, template_string in sites:
+            container: Any = agent_spec
+            for key in path[:-1]:
+                container = container[key]
+            container[path[-1]] = make_replacements(template_string, use_replacements)
+
+        return agent_spec
+
+    @staticmethod
+    def find_substitution_sites(spec: Any, markers: Tuple[str, ...], path: Tuple[Any, ...] = ()) \
+            -> List[Tuple[Tuple[Any, ...], str]]:
+        """
+        Find all the strings in an agent spec that contain any of the given markers.
+        :param spec: The agent spec (or any part of it) to search
+        :param markers: The substrings to look for
+        :param path: The path of keys/indexes from the top of the spec to this part of it
+        :return: A list of (path, string) tuples for each string containing a marker
+        """
+        sites: List[Tuple[Tuple[Any, ...], str]] = []
+        if isinstance(spec, dict):
+            for key, value in spec.items():
+                sites.extend(CreateNetworks.find_substitution_sites(value, markers, path + (key,)))
+        elif isinstance(spec, list):
+            for index, value in enumerate(spec):
+                sites.extend(CreateNetworks.find_substitution_sites(value, markers, path + (index,)))
+        elif isinstance(spec, str) and any(marker in spec for marker in markers):
+            sites.append((path, spec))
+        return sites
+
     def filter_agent(self, agent_spec: Dict[str, Any], replacements: Dict[str, Any]) -> Dict[str, Any]:
         """
         Common filters
@@ -321,29 +507,25 @@ class CreateNetworks(CodedTool):
 
         # Set up string replacements and include AAOSA stuff that we have to do
         # ourselves because we are creating a dictionary and not a hocon file.
-        string_replacements: Dict[str, str] = {
-            "aaosa_command": self.aaosa_defs.get("aaosa_command"),
-            "aaosa_instructions": self.aaosa_defs.get("aaosa_instructions")
-        }
-        string_replacements.update(replacements)
+        string_replacements: Dict[str, str] = {**self.aaosa_replacements, **replacements}
         string_filter = StringCommonDefsConfigFilter(string_replacements)
         network_spec = string_filter.filter_config(network_spec)
 
-        # Similarly set up dictionary value replacements
-        dict_replacements: Dict[str, Any] = {
-            "aaosa_call": self.aaosa_defs.get("aaosa_call"),
-        }
-        dict_filter = DictionaryCommonDefsConfigFilter(dict_replacements)
+        # Similarly do dictionary value replacements
+        dict_filter = DictionaryCommonDefsConfigFilter(self.aaosa_dict_replacements)
         network_spec = dict_filter.filter_config(network_spec)
 
         # Retrieve the modified agent spec
         return network_spec["tools"][0]
 
-    def create_front_man(self, front_man: Dict[str, Any],
-                         group: Dict[str, Any],
+    def create_front_man(self, group: Dict[str, Any],
+                         grouping_json: Dict[str, Any],
                          tools: List[str] = None) -> Dict[str, Any]:
         """
-        Creates a front man
+        Creates a front man from the front man template
+        :param group: The group the front man is for
+        :param grouping_json: The grouping_json the group comes from
+        :param tools: The list of tools for the front man
         """
 
         use_name: str = self.filter_name(group.get("name"))
@@ -352,10 +534,10 @@ class CreateNetworks(CodedTool):
         string_replacements: Dict[str, Any] = {
             "one_group": use_name,
             "group_description": group.get("description"),
-            "structure_description": self.grouping_json.get("description"),
-            "title": self.grouping_json.get("name"),
+            "structure_description": grouping_json.get("description"),
+            "title": grouping_json.get("name"),
         }
-        front_man = self.filter_agent(front_man, string_replacements)
+        front_man: Dict[str, Any] = self.fill_substitution_plan(self.front_man_plan, string_replacements)
 
         front_man["tools"] = tools
 
@@ -365,42 +547,39 @@ class CreateNetworks(CodedTool):
                                     name_to_network: Dict[str, Dict[str, Any]]) \
             -> Dict[Reservation, Dict[str, Any]]:
         """
-        Creates reservations for each named network
+        Creates reservations for each named network.
+        There is no batch call on the Reservationist, so all the reserve() calls are made concurrently.
         """
-        deployments: Dict[Reservation, Dict[str, Any]] = {}
-
-        for name, network in name_to_network.items():
-            # Filter names to change spaces to underscores because tool names don't like spaces.
-            # Reduces errors.
-            filtered_name: str = self.filter_name(name)
-            reservation: Reservation = await reservationist.reserve(lifetime_in_seconds=self.LIFETIME,
-                                                                    prefix=filtered_name)
-            deployments[reservation] = network
+        # Filter names to change spaces to underscores because tool names don't like spaces.
+        # Reduces errors.
+        reservations: List[Reservation] = await gather(*(
+            reservationist.reserve(lifetime_in_seconds=self.LIFETIME, prefix=self.filter_name(name))
+            for name in name_to_network.keys()))
 
+        deployments: Dict[Reservation, Dict[str, Any]] = dict(zip(reservations, name_to_network.values()))
         return deployments
 
-    def make_group_network(self, reservations: List[Reservation]) -> Dict[str, Any]:
+    def make_group_network(self, reservations: List[Reservation], grouping_json: Dict[str, Any]) -> Dict[str, Any]:
         """
         Creates a final front-man network for the rest.
+        :param reservations: The reservations of the networks the front man will call
+        :param grouping_json: The grouping_json describing the group network
         """
 
-        agent_spec: Dict[str, Any] = deepcopy(self.network_template)
+        # The skeleton has no content node, which suits us, as we are using external networks for those.
+        agent_spec: Dict[str, Any] = _from_json_blob(self.network_skeleton_json)
         tools: List[Dict[str, Any]] = agent_spec.get("tools")
 
-        # We don't need the content node, we are using external networks for those.
-        _ = tools.pop()
-
         # Make a list of the external networks for the reservations to reference as tools
         external_tools: List[str] = []
         for reservation in reservations:
             res_id: str = reservation.get_url()
-            if not res_id.startswith("/") or not res_id.startswith("http"):
+            if not res_id.startswith(("/", "http")):
                 res_id = "http://localhost/" + res_id
             external_tools.append(res_id)
 
-        # Start out with the front man from the template, but replace him with what's made.
-        front_man: Dict[str, Any] = tools[self.TEMPLATE_FRONT_MAN_INDEX]
-        front_man = self.create_front_man(front_man, self.grouping_json, external_tools)
+        # Replace the front man from the template with what's made.
+        front_man: Dict[str, Any] = self.create_front_man(grouping_json, grouping_json, external_tools)
         front_man["function"]["description"] = front_man["user_prompt"]
         tools[self.TEMPLATE_FRONT_MAN_INDEX] = front_man
 
@@ -420,16 +599,18 @@ class CreateNetworks(CodedTool):
             reservation_info.append(one_info)
         return reservation_info
 
-    async def assemble_group_of_groups(self, reservationist: Reservationist) -> Dict[Reservation, Dict[str, Any]]:
+    async def assemble_group_of_groups(self, reservationist: Reservationist,
+                                       grouping_json: Dict[str, Any]) -> Dict[Reservation, Dict[str, Any]]:
         """
         Assemble network that is a group of groups that already have reservations.
         :param reservationist:  The reservationist for this coded tool
+        :param grouping_json: The grouping_json whose groups carry the existing reservations
         :return: A dictionary of reservation -> network
         """
 
         converter = ReservationDictionaryConverter()
 
-        groups: List[Dict[str, Any]] = self.grouping_json.get("groups")
+        groups: List[Dict[str, Any]] = grouping_json.get("groups")
         group_reservations: List[Reservation] = []
         for group in groups:
 
@@ -437,15 +618,35 @@ class CreateNetworks(CodedTool):
             reservation: Reservation = converter.from_dict(reservation_dict)
             group_reservations.append(reservation)
 
-        deployments: Dict[Reservation, Dict[str, Any]] = await self.assemble_group_network(group_reservations,
-                                                                                           reservationist)
+        reservation: Reservation = await self.reserve_group_network(reservationist, grouping_json)
+        deployments: Dict[Reservation, Dict[str, Any]] = self.assemble_group_network(group_reservations,
+                                                                                     reservation, grouping_json)
 
         return deployments
 
+    @classmethod
+    def clear_content_cache(cls):
+        """
+        Forget all cached content files, for when they change on disk in ways
+        their modification times and sizes do not show.
+        """
+        _read_content_cached.cache_clear()
+
+    @staticmethod
+    def pretty_json(obj: Any) -> str:
+        """
+        :param obj: The JSON-serializable object to format
+        :return: An indented JSON string with sorted keys for logging
+        """
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+
     @staticmethod
+    @lru_cache(maxsize=1024)
     def filter_name(instring: str) -> str:
         """
         Filter names to change spaces to underscores because tool names don't like spaces.
+        The same names get filtered for their reservations and again for their front men,
+        so the results are remembered.
         """
         filtered_name: str = instring.replace(" ", "_")
         filtered_name = filtered_name.replace(".", "_")
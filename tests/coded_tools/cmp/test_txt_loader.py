@@ -7,6 +7,10 @@
 # Purchase of a commercial license is mandatory for any use of the
 # neuro-san-studio SDK Software in commercial settings.
 #
+from asyncio import run
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from coded_tools.cmp.txt_loader import TxtLoader
@@ -29,3 +33,32 @@ class TestTxtLoader(TestCase):
         first_line = content.splitlines()[0]
         expected_first_line = "|  | United Nations | FCCC/KP/CMP/2014/9/Add.1 |"
         self.assertEqual(expected_first_line, first_line)
+
+    def test_async_invoke(self):
+        """
+        Tests the async_invoke method of the TxtLoader CodedTool.
+        Checks the asynchronous path loads the same content as the synchronous one.
+        """
+        loader = TxtLoader()
+        args = {"file_path": "documents/CMP/CMP_txt/CMP2014_10 Decisions_1_to_8.txt"}
+        content = run(loader.async_invoke(args=args, sly_data={}))
+        self.assertEqual(loader.invoke(args=args, sly_data={}), content)
+
+    def test_extract_txt_content_cache(self):
+        """
+        Tests that extract_txt_content serves repeat loads from its cache
+        and reads a file again once it has changed.
+        """
+        with TemporaryDirectory() as temp_dir:
+            txt_path = Path(temp_dir) / "cached.txt"
+            txt_path.write_text("first", encoding="utf-8")
+            self.assertEqual("first", TxtLoader.extract_txt_content(txt_path))
+
+            # pylint: disable=no-value-for-parameter
+            hits = TxtLoader.read_cached.cache_info().hits
+            self.assertEqual("first", TxtLoader.extract_txt_content(txt_path))
+            self.assertEqual(hits + 1, TxtLoader.read_cached.cache_info().hits)
+
+            txt_path.write_text("second!", encoding="utf-8")
+            utime(txt_path, ns=(0, 0))
+            self.assertEqual("second!", TxtLoader.extract_txt_content(txt_path))
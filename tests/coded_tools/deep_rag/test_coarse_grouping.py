@@ -0,0 +1,379 @@
+# Copyright (C) 2023-2025 Cognizant Digital Business, Evolutionary AI.
+# All Rights Reserved.
+# Issued under the Academic Public License.
+#
+# You can be released from the terms, and requirements of the Academic Public
+# License by purchasing a commercial license.
+# Purchase of a commercial license is mandatory for any use of the
+# neuro-san-studio SDK Software in commercial settings.
+#
+from asyncio import Lock
+from asyncio import run
+from asyncio import sleep
+from json import dumps
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from typing import Dict
+from typing import List
+from unittest import TestCase
+
+from coded_tools.deep_rag.coarse_grouping import CoarseGrouping
+
+
+class StubCoarseGrouping(CoarseGrouping):  # pylint: disable=too-many-ancestors
+    """
+    A CoarseGrouping whose use_tool() stands in for the rough_substructure and create_network tools,
+    so the tool call orchestration can be tested without an agent hierarchy.
+    """
+
+    def __init__(self, latency: float = 0.05, first_call_latency: Dict[str, float] = None,
+                 later_calls_fail: List[str] = (), unsolvable: List[str] = ()):
+        """
+        Constructor
+        :param latency: The number of seconds each rough_substructure call takes
+        :param first_call_latency: A dictionary of file name -> the number of seconds the first
+                    rough_substructure call on a file list starting with that file takes
+        :param later_calls_fail: File names for which every rough_substructure call on a file list
+                    starting with it fails at once, except for the first call
+        :param unsolvable: File names which rough_substructure never groups properly
+        """
+        # pylint: disable=super-init-not-called
+        self.latency: float = latency
+        self.first_call_latency: Dict[str, float] = first_call_latency or {}
+        self.later_calls_fail: List[str] = later_calls_fail
+        self.unsolvable: List[str] = unsolvable
+        self.rough_calls: List[List[str]] = []
+        self.network_calls: List[Dict[str, Any]] = []
+
+    async def use_tool(self, tool_name: str, tool_args: Dict[str, Any], sly_data: Dict[str, Any]) -> str:
+        """
+        Stands in for the tools called by CoarseGrouping
+        """
+        if tool_name == "rough_substructure":
+            return await self.rough_substructure(tool_args.get("file_list"))
+
+        group_number: int = tool_args.get("group_number")
+        self.network_calls.append(tool_args)
+        sly_data["group_results"][group_number] = {
+            "agent_reservations": [{"reservation_id": f"network-{group_number}"}],
+            "grouping_json": tool_args.get("grouping_json")
+        }
+        return f"Made network {group_number}"
+
+    async def rough_substructure(self, file_list: List[str]) -> str:
+        """
+        Stands in for the rough_substructure tool
+        """
+        first_file: str = file_list[0]
+        first_call: bool = file_list not in self.rough_calls
+        self.rough_calls.append(file_list)
+        if not first_call and first_file in self.later_calls_fail:
+            raise RuntimeError(f"rough_substructure failed on {first_file}")
+
+        latency: float = self.latency
+        if first_call:
+            latency = self.first_call_latency.get(first_file, latency)
+        await sleep(latency)
+
+        if any(file_name in self.unsolvable for file_name in file_list):
+            return "Sorry, I could not group these."
+
+        grouping: Dict[str, Any] = {
+            "name": "Grouping",
+            # Tells apart which call's grouping ended up being networked
+            "description": "A first grouping" if first_call else "A later grouping",
+            "groups": [{"name": file_name, "description": file_name, "files": {file_name: file_name}}
+                       for file_name in file_list]
+        }
+        return f"```json\n{dumps(grouping)}\n```"
+
+
+class TestCoarseGrouping(TestCase):  # pylint: disable=too-many-public-methods
+    """
+    Tests the group planning of the CoarseGrouping CodedTool.
+    """
+
+    def test_create_groups_single_group(self):
+        """
+        Tests that a list which fits within the maximum group size stays as a single group.
+        """
+        items = list(range(42))
+        groups = CoarseGrouping.create_groups(items, 42)
+        self.assertEqual([items], groups)
+
+    def test_create_groups_keeps_every_item(self):
+        """
+        Tests that breaking up a list keeps every item exactly once, in order,
+        with balanced group sizes that respect the maximum group size.
+        """
+        items = list(range(100))
+        groups = CoarseGrouping.create_groups(items, 42)
+        self.assertEqual([34, 33, 33], [len(group) for group in groups])
+        self.assertEqual(items, [item for group in groups for item in group])
+
+    def test_lpt_partition_balances_sizes(self):
+        """
+        Tests that LPT partitioning evens out the total size per group,
+        respects the maximum group size and keeps the original order within each group.
+        """
+        items = ["a", "b", "c", "d", "e", "f"]
+        sizes = [10, 1, 1, 1, 1, 6]
+        self.assertEqual([["a"], ["b", "c", "d", "e", "f"]], CoarseGrouping.lpt_partition(items, sizes, 2, 5))
+
+        # A full group takes no more items, even when it is the lightest.
+        groups = CoarseGrouping.lpt_partition(items, sizes, 2, 4)
+        self.assertEqual([["a", "e"], ["b", "c", "d", "f"]], groups)
+        self.assertEqual(sorted(items), sorted(item for group in groups for item in group))
+
+    def test_get_int_arg(self):
+        """
+        Tests that integer args come back as ints whether or not they were passed as ints.
+        """
+        args = {"as_int": 7, "as_str": "8"}
+        self.assertEqual(7, CoarseGrouping.get_int_arg(args, "as_int", 42))
+        self.assertEqual(8, CoarseGrouping.get_int_arg(args, "as_str", 42))
+        self.assertEqual(42, CoarseGrouping.get_int_arg(args, "missing", 42))
+
+    def test_no_backups_with_even_latencies(self):
+        """
+        Tests that no backup rough_substructure calls are made when no group is slow.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        run(coarse_grouping.async_invoke(self.straggler_args(), {}))
+        self.assertEqual(20, len(coarse_grouping.rough_calls))
+        self.assertEqual(20, len(coarse_grouping.network_calls) - self.num_groups_of_groups(coarse_grouping))
+
+    def test_backup_for_straggler(self):
+        """
+        Tests that a single backup rough_substructure call is made for a group that is really slow,
+        and that the result of the backup is the one used.
+        """
+        coarse_grouping = StubCoarseGrouping(first_call_latency={"f07.txt": 2.0})
+        run(coarse_grouping.async_invoke(self.straggler_args(), {}))
+        self.assertEqual(21, len(coarse_grouping.rough_calls))
+        self.assertEqual(2, coarse_grouping.rough_calls.count(["f07.txt"]))
+        self.assertEqual(20, len(coarse_grouping.network_calls) - self.num_groups_of_groups(coarse_grouping))
+
+        descriptions: Dict[str, str] = {
+            file_name: network_call.get("grouping_json").get("description")
+            for network_call in coarse_grouping.network_calls
+            if network_call.get("files_directory")
+            for group in network_call.get("grouping_json").get("groups")
+            for file_name in group.get("files")
+        }
+        self.assertEqual("A later grouping", descriptions.get("f07.txt"))
+        self.assertEqual("A first grouping", descriptions.get("f06.txt"))
+
+    def test_failing_backup(self):
+        """
+        Tests that a backup call which fails does not fail or cut short the original call.
+        """
+        coarse_grouping = StubCoarseGrouping(first_call_latency={"f07.txt": 0.5}, later_calls_fail=["f07.txt"])
+        run(coarse_grouping.async_invoke(self.straggler_args(), {}))
+        self.assertEqual(21, len(coarse_grouping.rough_calls))
+        network_files: List[str] = [file_name for network_call in coarse_grouping.network_calls
+                                    for group in network_call.get("grouping_json").get("groups")
+                                    for file_name in group.get("files", {})]
+        self.assertIn("f07.txt", network_files)
+
+    def test_no_backups_when_turned_off(self):
+        """
+        Tests that a backup_fraction of 1.0 turns backup calls off, even for a slow group.
+        """
+        coarse_grouping = StubCoarseGrouping(first_call_latency={"f07.txt": 0.5})
+        run(coarse_grouping.async_invoke(self.straggler_args(backup_fraction=1.0), {}))
+        self.assertEqual(20, len(coarse_grouping.rough_calls))
+
+    @staticmethod
+    def straggler_args(**more_args) -> Dict[str, Any]:
+        """
+        :return: Args for 20 file groups of one file each
+        """
+        args: Dict[str, Any] = {
+            "file_list": [f"f{index:02d}.txt" for index in range(20)],
+            "files_directory": "files",
+            "max_group_size": 1,
+            "balance_by_size": False
+        }
+        args.update(more_args)
+        return args
+
+    @staticmethod
+    def num_groups_of_groups(coarse_grouping: StubCoarseGrouping) -> int:
+        """
+        :return: The number of create_network calls that were for groups of groups
+        """
+        return len([network_call for network_call in coarse_grouping.network_calls
+                    if not network_call.get("files_directory")])
+
+    def test_split_up_list_ends_at_single_files(self):
+        """
+        Tests that splitting a file list which rough_substructure cannot group stops at single files,
+        which are then networked on their own, and that no rough_substructure call is spent on no files.
+        """
+        coarse_grouping = StubCoarseGrouping(latency=0.0, unsolvable=["c.txt"])
+        args: Dict[str, Any] = {
+            "file_list": ["a.txt", "b.txt", "c.txt"],
+            "files_directory": "files"
+        }
+        run(coarse_grouping.async_invoke(args, {}))
+
+        self.assertNotIn([], coarse_grouping.rough_calls)
+        # Retries on [a, b, c], then [a], then retries on [b, c], then [b], then retries on [c].
+        self.assertEqual(3 + 1 + 3 + 1 + 3, len(coarse_grouping.rough_calls))
+        network_files: List[List[str]] = sorted(
+            [file_name for group in network_call.get("grouping_json").get("groups")
+             for file_name in group.get("files")]
+            for network_call in coarse_grouping.network_calls
+            if network_call.get("files_directory"))
+        self.assertEqual([["a.txt"], ["b.txt"], ["c.txt"]], network_files)
+
+    def test_split_up_list_empty(self):
+        """
+        Tests that splitting an empty file list makes no tool calls.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        sly_data: Dict[str, Any] = {"group_results": [{}]}
+        result: str = run(coarse_grouping.split_up_list(0, {"file_list": []}, sly_data, {}))
+        self.assertTrue(result.startswith("Error:"))
+        self.assertEqual([], coarse_grouping.rough_calls)
+        self.assertEqual([], coarse_grouping.network_calls)
+
+    def test_split_up_list_single_file(self):
+        """
+        Tests that splitting a single file list networks the file on its own without calling rough_substructure.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        sly_data: Dict[str, Any] = {"group_results": [{}]}
+        tool_args: Dict[str, Any] = {"file_list": ["a.txt"], "files_directory": "files"}
+        run(coarse_grouping.split_up_list(0, tool_args, sly_data, {}))
+        self.assertEqual([], coarse_grouping.rough_calls)
+        self.assertEqual(1, len(coarse_grouping.network_calls))
+        groups: List[Dict[str, Any]] = coarse_grouping.network_calls[0].get("grouping_json").get("groups")
+        self.assertEqual([["a.txt"]], [list(group.get("files")) for group in groups])
+
+    def test_no_files(self):
+        """
+        Tests that an empty file list is an error, without any tool calls.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        result: str = run(coarse_grouping.async_invoke({"file_list": []}, {}))
+        self.assertEqual("Error: No files provided in the file_list.", result)
+        self.assertEqual([], coarse_grouping.rough_calls)
+        self.assertEqual([], coarse_grouping.network_calls)
+
+    def test_bad_max_group_size(self):
+        """
+        Tests that a max_group_size which is not positive is an error, without any tool calls.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        for max_group_size in (0, -1):
+            args: Dict[str, Any] = {"file_list": ["a.txt"], "max_group_size": max_group_size}
+            result: str = run(coarse_grouping.async_invoke(args, {}))
+            self.assertEqual(f"Error: max_group_size must be positive, not {max_group_size}.", result)
+        self.assertEqual([], coarse_grouping.rough_calls)
+        self.assertEqual([], coarse_grouping.network_calls)
+
+    def test_get_bool_arg(self):
+        """
+        Tests that boolean args passed as strings are parsed rather than taken as truthy.
+        """
+        args = {"as_bool": False, "as_str": "false", "as_upper": " TRUE ", "as_other": "maybe"}
+        self.assertFalse(CoarseGrouping.get_bool_arg(args, "as_bool", True))
+        self.assertFalse(CoarseGrouping.get_bool_arg(args, "as_str", True))
+        self.assertTrue(CoarseGrouping.get_bool_arg(args, "as_upper", False))
+        self.assertTrue(CoarseGrouping.get_bool_arg(args, "as_other", True))
+        self.assertTrue(CoarseGrouping.get_bool_arg(args, "missing", True))
+
+    def test_balance_by_size(self):
+        """
+        Tests that file groups are balanced by file size, with missing files counting as empty.
+        """
+        with TemporaryDirectory() as files_directory:
+            self.write_files(files_directory, {"a.txt": 100, "b.txt": 100})
+            # c.txt and d.txt are missing
+            self.assertEqual([["a.txt", "c.txt"], ["b.txt", "d.txt"]], self.first_file_groups(files_directory))
+
+    def test_balance_by_size_uniform(self):
+        """
+        Tests that file groups stay contiguous when all the files are the same size.
+        """
+        with TemporaryDirectory() as files_directory:
+            self.write_files(files_directory, {"a.txt": 10, "b.txt": 10, "c.txt": 10, "d.txt": 10})
+            self.assertEqual([["a.txt", "b.txt"], ["c.txt", "d.txt"]], self.first_file_groups(files_directory))
+
+        with TemporaryDirectory() as files_directory:
+            # All missing
+            self.assertEqual([["a.txt", "b.txt"], ["c.txt", "d.txt"]], self.first_file_groups(files_directory))
+
+    def test_balance_by_size_off(self):
+        """
+        Tests that file groups stay contiguous when balance_by_size is turned off with a string.
+        """
+        with TemporaryDirectory() as files_directory:
+            self.write_files(files_directory, {"a.txt": 100, "b.txt": 100, "c.txt": 1, "d.txt": 1})
+            self.assertEqual([["a.txt", "b.txt"], ["c.txt", "d.txt"]],
+                             self.first_file_groups(files_directory, balance_by_size="false"))
+
+    @staticmethod
+    def write_files(files_directory: str, file_sizes: Dict[str, int]):
+        """
+        Write files of the given sizes into the directory
+        """
+        for file_name, size in file_sizes.items():
+            (Path(files_directory) / file_name).write_text("x" * size, encoding="utf-8")
+
+    @staticmethod
+    def first_file_groups(files_directory: str, **more_args) -> List[List[str]]:
+        """
+        :return: The sorted file groups first given to rough_substructure for files a.txt to d.txt
+                in groups of at most two
+        """
+        coarse_grouping = StubCoarseGrouping(latency=0.0)
+        args: Dict[str, Any] = {
+            "file_list": ["a.txt", "b.txt", "c.txt", "d.txt"],
+            "files_directory": files_directory,
+            "max_group_size": 2
+        }
+        args.update(more_args)
+        run(coarse_grouping.async_invoke(args, {}))
+        return sorted(coarse_grouping.rough_calls)
+
+    def test_process_group_results(self):
+        """
+        Tests that mid-level networks stay paired with their own grouping_json when a group is skipped,
+        and that sub-networks come before the mid-level networks, with the group of groups last.
+        """
+        coarse_grouping = StubCoarseGrouping()
+        sly_data: Dict[str, Any] = {
+            "group_results": [
+                {
+                    "agent_reservations": [{"reservation_id": "sub-0"}, {"reservation_id": "mid-0"}],
+                    "grouping_json": {"name": "zero", "description": "Group zero"}
+                },
+                {
+                    # create_network published nothing for this group
+                    "grouping_json": {"name": "one", "description": "Group one"}
+                },
+                {
+                    "agent_reservations": [{"reservation_id": "sub-2a"}, {"reservation_id": "sub-2b"},
+                                           {"reservation_id": "mid-2"}],
+                    "grouping_json": {"name": "two", "description": "Group two"}
+                },
+            ],
+            "num_groups": 3,
+            "lock": Lock(),
+            "agent_reservations": []
+        }
+        output: str = run(coarse_grouping.process_group_results(sly_data, {}))
+
+        self.assertEqual(1, len(coarse_grouping.network_calls))
+        high_level_groups: List[Dict[str, Any]] = coarse_grouping.network_calls[0].get("grouping_json").get("groups")
+        self.assertEqual([("zero", "mid-0"), ("two", "mid-2")],
+                         [(group.get("name"), group.get("reservation").get("reservation_id"))
+                          for group in high_level_groups])
+
+        self.assertEqual(["sub-0", "sub-2a", "sub-2b", "mid-0", "mid-2", "network-3"],
+                         [reservation.get("reservation_id") for reservation in sly_data.get("agent_reservations")])
+        self.assertIn("network-3", output)
@@ -0,0 +1,121 @@
+# Copyright (C) 2023-2025 Cognizant Digital Business, Evolutionary AI.
+# All Rights Reserved.
+# Issued under the Academic Public License.
+#
+# You can be released from the terms, and requirements of the Academic Public
+# License by purchasing a commercial license.
+# Purchase of a commercial license is mandatory for any use of the
+# neuro-san-studio SDK Software in commercial settings.
+#
+from asyncio import run
+from os import environ
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from neuro_san.internals.reservations.agent_reservation import AgentReservation
+
+from coded_tools.deep_rag.create_networks import CreateNetworks
+
+
+class TestCreateNetworks(TestCase):
+    """
+    Tests the agent spec assembly of the CreateNetworks CodedTool.
+    """
+
+    def test_create_one_content_agent(self):
+        """
+        Tests that a content agent made from the pre-filtered content template
+        is the same as running the full CommonDefs filters on the content template.
+        """
+        create_networks = CreateNetworks()
+        file_content = "Some {aaosa_command} content.\nWith {braces} and {one_content_file} in it.\n"
+        with TemporaryDirectory() as temp_dir:
+            files_directory = Path(temp_dir)
+            (files_directory / "section.txt").write_text(file_content, encoding="utf-8")
+            content_agent = run(create_networks.create_one_content_agent("section.txt", "section_txt",
+                                                                         files_directory))
+
+        content_template = create_networks.network_template.get("tools")[-1]
+        expected = create_networks.filter_agent(content_template, {
+            "one_content_file": "section_txt",
+            "content": file_content,
+        })
+        self.assertEqual(expected, content_agent)
+
+    def test_create_front_man(self):
+        """
+        Tests that a front man made from the pre-filtered front man template
+        is the same as running the full CommonDefs filters on the front man template.
+        """
+        create_networks = CreateNetworks()
+        group = {"name": "Group One.txt", "description": None}
+        grouping_json = {"name": "Title", "description": "How the {title} is structured"}
+        front_man = create_networks.create_front_man(group, grouping_json, ["tool_one", "tool_two"])
+
+        front_man_template = create_networks.network_template.get("tools")[0]
+        expected = create_networks.filter_agent(front_man_template, {
+            "one_group": "Group_One_txt",
+            "group_description": None,
+            "structure_description": "How the {title} is structured",
+            "title": "Title",
+        })
+        expected["tools"] = ["tool_one", "tool_two"]
+        self.assertEqual(expected, front_man)
+
+    def test_make_group_network_tool_urls(self):
+        """
+        Tests that only the reservation urls which are not already absolute get the localhost prefix.
+        """
+        create_networks = CreateNetworks()
+        grouping_json = {"name": "Title", "description": "Grouping of groups"}
+
+        with patch.dict(environ, {"AGENT_EXTERNAL_SERVER_URL": "http://agents.example/"}):
+            external = AgentReservation(60, "external")
+            external_url = external.get_url()
+            external_network = create_networks.make_group_network([external], grouping_json)
+        self.assertEqual([external_url], external_network["tools"][0]["tools"])
+
+        with patch.dict(environ):
+            environ.pop("AGENT_EXTERNAL_SERVER_URL", None)
+            local = AgentReservation(60, "local")
+            local_url = local.get_url()
+            local_network = create_networks.make_group_network([local], grouping_json)
+        self.assertEqual(["http://localhost/" + local_url], local_network["tools"][0]["tools"])
+
+    def test_templates_loaded_once(self):
+        """
+        Tests that the templates are only loaded once and are shared by all instances.
+        """
+        first = CreateNetworks()
+        second = CreateNetworks()
+        self.assertIsNotNone(first.network_template)
+        self.assertIs(first.network_template, second.network_template)
+        self.assertIs(first.content_plan, second.content_plan)
+
+    def test_content_cache(self):
+        """
+        Tests that content files are read again once they have changed on disk or the cache is cleared.
+        """
+        create_networks = CreateNetworks()
+        with TemporaryDirectory() as temp_dir:
+            files_directory = Path(temp_dir)
+            content_path = files_directory / "cached.txt"
+            content_path.write_text("first", encoding="utf-8")
+            first = run(create_networks.create_one_content_agent("cached.txt", "cached_txt", files_directory))
+
+            content_path.write_text("second!", encoding="utf-8")
+            utime(content_path, ns=(0, 0))
+            second = run(create_networks.create_one_content_agent("cached.txt", "cached_txt", files_directory))
+            self.assertNotEqual(first, second)
+
+            # Same size and modification time, so only clearing the cache shows the change.
+            content_path.write_text("third!!", encoding="utf-8")
+            utime(content_path, ns=(0, 0))
+            unchanged = run(create_networks.create_one_content_agent("cached.txt", "cached_txt", files_directory))
+            self.assertEqual(second, unchanged)
+            CreateNetworks.clear_content_cache()
+            third = run(create_networks.create_one_content_agent("cached.txt", "cached_txt", files_directory))
+            self.assertNotEqual(second, third)